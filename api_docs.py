@@ -1,13 +1,37 @@
 # api_docs.py
 import ast
+import functools
 import inspect
 from typing import Dict, List, Any
 import logging
 import re
+from collections import Counter, defaultdict
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import; _parse_docstring runs one match per line,
+# dispatching on whichever alternation fired
+_PATH_PARAM_RE = re.compile(r'\{([^}]+)\}')
+
+_LINE_RE = re.compile(
+    r'(?P<section>parameters|returns|raises)\s*:'
+    r'|(?P<pname>\w+)\s*:\s*(?P<pval>.+)',
+    re.I
+)
+
+# Endpoint definitions never nest inside pure expressions, so those
+# subtrees can be skipped during traversal
+_EXPR_TYPES = frozenset(
+    t for t in vars(ast).values()
+    if isinstance(t, type) and issubclass(t, ast.expr)
+)
+
+@functools.lru_cache(maxsize=64)
+def _cached_parse(code: str) -> ast.AST:
+    """Parse source once per unique string; reruns reuse the cached tree."""
+    return ast.parse(code)
+
 @dataclass
 class APIEndpoint:
     path: str
@@ -20,16 +44,45 @@ class APIEndpoint:
 class APIDocumentationGenerator:
     def __init__(self):
         self.endpoints = []
+        # Grouping and counts are maintained at insert time so the
+        # generate_* passes don't have to rebuild them per render
+        self._by_path = defaultdict(list)
+        self._method_counts = Counter()
+        # Annotation nodes are revisited when endpoints share signatures.
+        # Keyed by id(node), so it is cleared per parse: once a tree is
+        # evicted from _cached_parse and collected, its node ids can be
+        # reused by a later parse
+        self._type_cache = {}
     
     def parse_fastapi_app(self, code: str):
         """Parse FastAPI application code to extract API endpoints"""
         try:
-            tree = ast.parse(code)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    self._parse_router_class(node)
-                elif isinstance(node, ast.FunctionDef):
-                    self._parse_endpoint(node)
+            # id-keyed entries from an earlier, possibly collected tree
+            # must not leak into this parse
+            self._type_cache.clear()
+            tree = _cached_parse(code)
+            # Typed dispatch on exact node class instead of isinstance chains;
+            # router classes consume their own methods, so class bodies are
+            # not descended into (avoids parsing each method twice)
+            dispatch = {
+                ast.ClassDef: self._parse_router_class,
+                ast.FunctionDef: self._parse_endpoint,
+            }
+            dispatch_get = dispatch.get
+            iter_children = ast.iter_child_nodes
+            expr_types = _EXPR_TYPES
+            class_def = ast.ClassDef
+            stack = [tree]
+            pop = stack.pop
+            extend = stack.extend
+            while stack:
+                node = pop()
+                node_type = type(node)
+                handler = dispatch_get(node_type)
+                if handler:
+                    handler(node)
+                if node_type is not class_def and node_type not in expr_types:
+                    extend(iter_children(node))
         except Exception as e:
             logger.error(f"Error parsing FastAPI app: {str(e)}")
     
@@ -48,24 +101,30 @@ class APIDocumentationGenerator:
             auth_required = False
             
             for decorator in node.decorator_list:
-                if isinstance(decorator, ast.Call):
-                    if hasattr(decorator.func, 'attr'):
-                        method = decorator.func.attr.lower()
+                decorator_type = type(decorator)
+                if decorator_type is ast.Call:
+                    func = decorator.func
+                    func_type = type(func)
+                    if func_type is ast.Attribute:
+                        method = func.attr.lower()
                         # Extract path from args or keywords
                         for arg in decorator.args:
-                            if isinstance(arg, ast.Str):
-                                path = arg.s
+                            if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                                path = arg.value
+                                break
                         for kw in decorator.keywords:
-                            if kw.arg == 'path':
-                                path = kw.value.s
-                    elif isinstance(decorator.func, ast.Name):
-                        if decorator.func.id == 'requires_auth':
-                            auth_required = True
-            
+                            if kw.arg == 'path' and isinstance(kw.value, ast.Constant):
+                                path = kw.value.value
+                    elif func_type is ast.Name and func.id == 'requires_auth':
+                        auth_required = True
+                elif decorator_type is ast.Name and decorator.id == 'requires_auth':
+                    # Bare @requires_auth without a call
+                    auth_required = True
+
             if path and method:
                 # Parse docstring
                 docstring = ast.get_docstring(node)
-                description = self._parse_docstring(docstring) if docstring else ""
+                description = self._parse_docstring(docstring or "")
                 
                 # Parse parameters
                 parameters = []
@@ -95,6 +154,8 @@ class APIDocumentationGenerator:
                 )
                 
                 self.endpoints.append(endpoint)
+                self._by_path[path].append(endpoint)
+                self._method_counts[method.upper()] += 1
         except Exception as e:
             logger.error(f"Error parsing endpoint: {str(e)}")
     
@@ -106,43 +167,52 @@ class APIDocumentationGenerator:
             'returns': '',
             'raises': []
         }
-        
+
+        # Accumulate into lists and join once; += on strings copies the
+        # whole accumulated text per line
+        desc_parts = []
+        ret_parts = []
         current_section = 'description'
         lines = docstring.split('\n')
-        
+
         for line in lines:
             line = line.strip()
-            if line.lower().startswith('parameters:'):
-                current_section = 'parameters'
-            elif line.lower().startswith('returns:'):
-                current_section = 'returns'
-            elif line.lower().startswith('raises:'):
-                current_section = 'raises'
-            elif line:
-                if current_section == 'description':
-                    sections['description'] += line + ' '
-                elif current_section == 'parameters':
-                    param_match = re.match(r'\s*(\w+)\s*:\s*(.+)', line)
-                    if param_match:
-                        sections['parameters'][param_match.group(1)] = param_match.group(2)
-                elif current_section == 'returns':
-                    sections['returns'] += line + ' '
-                elif current_section == 'raises':
-                    sections['raises'].append(line)
-        
+            if not line:
+                continue
+            match = _LINE_RE.match(line)
+            if match and match.group('section'):
+                current_section = match.group('section').lower()
+            elif current_section == 'description':
+                desc_parts.append(line)
+            elif current_section == 'parameters':
+                if match:
+                    sections['parameters'][match.group('pname')] = match.group('pval')
+            elif current_section == 'returns':
+                ret_parts.append(line)
+            elif current_section == 'raises':
+                sections['raises'].append(line)
+
+        if desc_parts:
+            sections['description'] = ' '.join(desc_parts) + ' '
+        if ret_parts:
+            sections['returns'] = ' '.join(ret_parts) + ' '
+
         return sections
     
     def _get_type_hint(self, node: ast.AST) -> str:
         """Convert AST type annotation to string representation"""
-        if isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Subscript):
-            value = self._get_type_hint(node.value)
-            slice_value = self._get_type_hint(node.slice)
-            return f"{value}[{slice_value}]"
-        elif isinstance(node, ast.Constant):
-            return str(node.value)
-        return "Any"
+        cached = self._type_cache.get(id(node))
+        if cached is not None:
+            return cached
+        # ast.unparse renders the whole annotation in one call and also
+        # handles forms the old recursion collapsed to "Any" (e.g. the
+        # tuple slice in Dict[str, int])
+        try:
+            result = ast.unparse(node)
+        except Exception:
+            result = "Any"
+        self._type_cache[id(node)] = result
+        return result
     
     def generate_openapi_spec(self) -> Dict[str, Any]:
         """Generate OpenAPI specification"""
@@ -155,23 +225,29 @@ class APIDocumentationGenerator:
             'paths': {}
         }
         
+        # Bind hot lookups to locals; attribute/dict chains dominate this loop
+        spec_paths = spec['paths']
         for endpoint in self.endpoints:
-            if endpoint.path not in spec['paths']:
-                spec['paths'][endpoint.path] = {}
-            
-            spec['paths'][endpoint.path][endpoint.method] = {
-                'summary': endpoint.description.get('description', ''),
-                'parameters': [
-                    {
-                        'name': param['name'],
-                        'in': 'path' if '{' + param['name'] + '}' in endpoint.path else 'query',
-                        'required': param['required'],
-                        'schema': {
-                            'type': param['type'].lower() if param['type'] else 'string'
-                        }
+            epath = endpoint.path
+            # One regex scan of the path instead of a substring search
+            # per parameter
+            path_params = frozenset(_PATH_PARAM_RE.findall(epath))
+
+            parameters = []
+            for param in endpoint.parameters:
+                ptype = param['type']
+                parameters.append({
+                    'name': param['name'],
+                    'in': 'path' if param['name'] in path_params else 'query',
+                    'required': param['required'],
+                    'schema': {
+                        'type': ptype.lower() if ptype else 'string'
                     }
-                    for param in endpoint.parameters
-                ],
+                })
+
+            operation = {
+                'summary': endpoint.description.get('description', ''),
+                'parameters': parameters,
                 'responses': {
                     '200': {
                         'description': 'Successful response',
@@ -185,27 +261,20 @@ class APIDocumentationGenerator:
                     }
                 }
             }
-            
+
             if endpoint.auth_required:
-                spec['paths'][endpoint.path][endpoint.method]['security'] = [
-                    {'bearerAuth': []}
-                ]
-        
+                operation['security'] = [{'bearerAuth': []}]
+
+            spec_paths.setdefault(epath, {})[endpoint.method] = operation
+
         return spec
     
     def generate_markdown_docs(self) -> str:
         """Generate Markdown documentation"""
         docs = ["# API Documentation\n\n"]
-        
-        # Group endpoints by path
-        grouped_endpoints = {}
-        for endpoint in self.endpoints:
-            if endpoint.path not in grouped_endpoints:
-                grouped_endpoints[endpoint.path] = []
-            grouped_endpoints[endpoint.path].append(endpoint)
-        
-        # Generate documentation for each path
-        for path, endpoints in grouped_endpoints.items():
+
+        # Endpoints are already grouped by path at insert time
+        for path, endpoints in self._by_path.items():
             docs.append(f"## {path}\n")
             
             for endpoint in endpoints:
@@ -259,8 +328,4 @@ class APIDocumentationGenerator:
     
     def _get_methods_distribution(self) -> Dict[str, int]:
         """Get distribution of HTTP methods across endpoints"""
-        distribution = {}
-        for endpoint in self.endpoints:
-            method = endpoint.method.upper()
-            distribution[method] = distribution.get(method, 0) + 1
-        return distribution
\ No newline at end of file
+        return dict(self._method_counts)
\ No newline at end of file
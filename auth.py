@@ -1,41 +1,76 @@
 # auth.py
 import streamlit as st
-from datetime import datetime
 import sqlite3
 import hashlib
+import secrets
+import time
+
+# hashlib.scrypt is missing on Python builds linked against OpenSSL
+# compiled without scrypt support
+_HAS_SCRYPT = hasattr(hashlib, 'scrypt')
 
 class Auth:
     def __init__(self):
         self.conn = sqlite3.connect('users.db', check_same_thread=False)
+        # WAL avoids an fsync of the rollback journal on every commit
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
         self.create_users_table()
     
     def create_users_table(self):
         query = '''CREATE TABLE IF NOT EXISTS users
                   (username TEXT PRIMARY KEY,
                    password TEXT,
-                   created_at DATETIME)'''
+                   salt TEXT,
+                   created_at INTEGER)'''
         self.conn.execute(query)
+        # Migrate databases created before salted hashing
+        try:
+            self.conn.execute('ALTER TABLE users ADD COLUMN salt TEXT')
+        except sqlite3.OperationalError:
+            pass
         self.conn.commit()
-    
-    def hash_password(self, password):
-        return hashlib.sha256(password.encode()).hexdigest()
-    
+
+    def hash_password(self, password, salt):
+        # scrypt runs its SHA-256 inner loop in OpenSSL (SHA-NI where
+        # available) and is a proper KDF, unlike a bare sha256 digest
+        if _HAS_SCRYPT:
+            return hashlib.scrypt(
+                password.encode(), salt=bytes.fromhex(salt),
+                n=2**14, r=8, p=1, dklen=32
+            ).hex()
+        # PBKDF2 keeps the whole iteration loop in C as well
+        return hashlib.pbkdf2_hmac(
+            'sha256', password.encode(), bytes.fromhex(salt), 200_000, dklen=32
+        ).hex()
+
     def register_user(self, username, password):
-        hashed_pwd = self.hash_password(password)
+        salt = secrets.token_bytes(16).hex()
+        hashed_pwd = self.hash_password(password, salt)
         try:
+            # Name the columns: on a database migrated via ALTER TABLE
+            # the salt column sits after created_at, so positional
+            # VALUES would swap the two
             self.conn.execute(
-                'INSERT INTO users VALUES (?, ?, ?)',
-                (username, hashed_pwd, datetime.now())
+                'INSERT INTO users (username, password, salt, created_at) VALUES (?, ?, ?, ?)',
+                (username, hashed_pwd, salt, time.time_ns() // 1000)
             )
             self.conn.commit()
             return True
         except sqlite3.IntegrityError:
             return False
-    
+
     def login_user(self, username, password):
-        hashed_pwd = self.hash_password(password)
         cursor = self.conn.execute(
-            'SELECT * FROM users WHERE username=? AND password=?',
-            (username, hashed_pwd)
+            'SELECT password, salt FROM users WHERE username=?',
+            (username,)
         )
-        return cursor.fetchone() is not None
\ No newline at end of file
+        row = cursor.fetchone()
+        if row is None:
+            return False
+        stored, salt = row
+        if salt is None:
+            # Account created before salted hashing
+            return stored == hashlib.sha256(password.encode()).hexdigest()
+        return secrets.compare_digest(stored, self.hash_password(password, salt))
\ No newline at end of file
@@ -1,43 +1,86 @@
 # code_analyzer.py
 import ast
+import functools
 from typing import Tuple, List, Dict
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=64)
+def _cached_parse(code: str) -> ast.AST:
+    """Parse source once per unique string; Streamlit reruns resubmit
+    the same code, so repeat analyses become a dict lookup."""
+    return ast.parse(code)
+
+# Statement fields worth descending into. FunctionDef/ClassDef/Import nodes
+# never appear inside pure expressions, so expression subtrees are skipped.
+# 'cases' covers match statements, whose arms hold their own body lists.
+_STMT_FIELDS = ('cases', 'handlers', 'finalbody', 'orelse', 'body')
+
 class CodeAnalyzer:
     @staticmethod
     def analyze_code_structure(code: str) -> Tuple[List[str], List[str], Dict]:
         """
         Analyze Python code and extract functions, classes, and their relationships.
-        
+
         Args:
             code (str): Python source code
-            
+
         Returns:
             Tuple containing lists of function names, class names, and their relationships
         """
         try:
-            tree = ast.parse(code)
-            functions = [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
-            classes = [node.name for node in ast.walk(tree) if isinstance(node, ast.ClassDef)]
-            
-            # Analyze relationships and dependencies
-            relationships = {
-                'class_methods': {},
-                'function_calls': [],
-                'imports': []
-            }
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    methods = [n.name for n in node.body if isinstance(n, ast.FunctionDef)]
-                    relationships['class_methods'][node.name] = methods
-                elif isinstance(node, ast.Import):
-                    relationships['imports'].extend(n.name for n in node.names)
-                    
-            return functions, classes, relationships
+            return CodeAnalyzer.analyze_ast(_cached_parse(code))
         except Exception as e:
             logger.error(f"Error analyzing code: {str(e)}")
-            return [], [], {}
\ No newline at end of file
+            return [], [], {}
+
+    @staticmethod
+    def analyze_ast(tree: ast.AST) -> Tuple[List[str], List[str], Dict]:
+        """
+        Analyze an already-parsed AST.
+
+        Callers that hold a tree (e.g. from _cached_parse) avoid a
+        second lex+parse of the same source.
+
+        Args:
+            tree (ast.AST): Parsed module tree
+
+        Returns:
+            Tuple containing lists of function names, class names, and their relationships
+        """
+        functions = []
+        classes = []
+
+        # Analyze relationships and dependencies
+        relationships = {
+            'class_methods': {},
+            'function_calls': [],
+            'imports': []
+        }
+
+        # Single pass over statement nodes instead of three ast.walk traversals
+        _FDef = ast.FunctionDef
+        _CDef = ast.ClassDef
+        _Import = ast.Import
+        stack = [tree]
+        pop = stack.pop
+        extend = stack.extend
+        while stack:
+            node = pop()
+            t = type(node)
+            if t is _FDef:
+                functions.append(node.name)
+            elif t is _CDef:
+                classes.append(node.name)
+                methods = [n.name for n in node.body if isinstance(n, _FDef)]
+                relationships['class_methods'][node.name] = methods
+            elif t is _Import:
+                relationships['imports'].extend(n.name for n in node.names)
+            for field in _STMT_FIELDS:
+                children = getattr(node, field, None)
+                if children:
+                    extend(reversed(children))
+
+        return functions, classes, relationships
\ No newline at end of file
@@ -1,6 +1,7 @@
 import streamlit as st
 import ollama
 import ast
+import functools
 import json
 from datetime import datetime
 import docx
@@ -9,8 +10,28 @@ import git
 import os
 from pathlib import Path
 import hashlib
+import inspect
+import operator
+import secrets
+import threading
+import time
 from typing import Optional, Dict, List
 
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
 # Authentication and User Management
 class UserManager:
     def __init__(self, data_path: str = "users.json"):
@@ -19,21 +40,39 @@ class UserManager:
 
     def _load_users(self):
         if os.path.exists(self.data_path):
-            with open(self.data_path, 'r') as f:
-                self.users = json.load(f)
+            with open(self.data_path, 'rb') as f:
+                self.users = _json_loads(f.read())
         else:
             self.users = {}
             self._save_users()
 
     def _save_users(self):
-        with open(self.data_path, 'w') as f:
-            json.dump(self.users, f)
+        # Write-then-rename keeps the user store intact on a crash
+        tmp_path = f"{self.data_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_json_dumps(self.users))
+        os.replace(tmp_path, self.data_path)
+
+    @staticmethod
+    def _hash_password(password: str, salt: str) -> str:
+        # scrypt is a proper KDF whose inner SHA-256 loop runs in OpenSSL
+        if hasattr(hashlib, 'scrypt'):
+            return hashlib.scrypt(
+                password.encode(), salt=bytes.fromhex(salt),
+                n=2**14, r=8, p=1, dklen=32
+            ).hex()
+        # PBKDF2 keeps the whole iteration loop in C as well
+        return hashlib.pbkdf2_hmac(
+            'sha256', password.encode(), bytes.fromhex(salt), 200_000, dklen=32
+        ).hex()
 
     def register_user(self, username: str, password: str) -> bool:
         if username in self.users:
             return False
+        salt = secrets.token_bytes(16).hex()
         self.users[username] = {
-            'password_hash': hashlib.sha256(password.encode()).hexdigest(),
+            'password_hash': self._hash_password(password, salt),
+            'salt': salt,
             'created_at': datetime.now().isoformat()
         }
         self._save_users()
@@ -42,7 +81,12 @@ class UserManager:
     def verify_user(self, username: str, password: str) -> bool:
         if username not in self.users:
             return False
-        return self.users[username]['password_hash'] == hashlib.sha256(password.encode()).hexdigest()
+        record = self.users[username]
+        salt = record.get('salt')
+        if salt is None:
+            # Account created before salted hashing
+            return record['password_hash'] == hashlib.sha256(password.encode()).hexdigest()
+        return secrets.compare_digest(record['password_hash'], self._hash_password(password, salt))
 
 # Documentation History Manager
 class DocumentationHistory:
@@ -52,33 +96,46 @@ class DocumentationHistory:
 
     def save_documentation(self, username: str, code: str, documentation: str) -> str:
         timestamp = datetime.now().isoformat()
-        doc_id = hashlib.md5(f"{username}{timestamp}".encode()).hexdigest()
-        
+        # Timestamp-prefixed ids let history sort on filename alone;
+        # time_ns keeps the prefix filesystem-safe (the ISO form has
+        # ':' which Windows rejects in filenames) and a fixed width,
+        # so lexical order matches creation order
+        doc_id = f"{time.time_ns()}_{hashlib.md5(f'{username}{timestamp}'.encode()).hexdigest()}"
+
         user_path = self.history_path / username
         user_path.mkdir(exist_ok=True)
-        
-        with open(user_path / f"{doc_id}.json", 'w') as f:
-            json.dump({
+
+        doc_path = user_path / f"{doc_id}.json"
+        tmp_path = user_path / f"{doc_id}.json.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_json_dumps({
                 'timestamp': timestamp,
                 'code': code,
                 'documentation': documentation
-            }, f)
-        
+            }))
+        os.replace(tmp_path, doc_path)
+
         return doc_id
 
     def get_user_history(self, username: str) -> List[Dict]:
         user_path = self.history_path / username
         if not user_path.exists():
             return []
-        
+
+        # scandir returns dirent info in one syscall per entry, and the
+        # timestamp-prefixed names sort newest-first without decoding JSON
+        with os.scandir(user_path) as it:
+            entries = [e for e in it if e.name.endswith('.json')]
+        entries.sort(key=lambda e: e.name, reverse=True)
+
         history = []
-        for file in user_path.glob("*.json"):
-            with open(file, 'r') as f:
-                data = json.load(f)
-                data['id'] = file.stem
-                history.append(data)
-        
-        return sorted(history, key=lambda x: x['timestamp'], reverse=True)
+        for entry in entries:
+            with open(entry.path, 'rb') as f:
+                data = _json_loads(f.read())
+            data['id'] = entry.name[:-len('.json')]
+            history.append(data)
+
+        return history
 
 # File Export Functions
 def export_to_pdf(documentation: str, filename: str):
@@ -103,8 +160,14 @@ def export_to_docx(documentation: str, filename: str):
 
 # Version Control Integration
 class GitManager:
+    # How long to keep collecting saves before committing them together
+    FLUSH_DELAY = 2.0
+
     def __init__(self, repo_path: str = "code_repository"):
         self.repo_path = Path(repo_path)
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._flush_timer = None
         self._initialize_repo()
 
     def _initialize_repo(self):
@@ -112,43 +175,125 @@ class GitManager:
             self.repo_path.mkdir(exist_ok=True)
             git.Repo.init(self.repo_path)
         self.repo = git.Repo(self.repo_path)
+        # Saves are batched into one commit, so per-object fsyncs are
+        # not worth their cost on rapid-fire generation clicks
+        config_writer = self.repo.config_writer()
+        config_writer.set_value("core", "fsyncObjectFiles", "false")
+        config_writer.release()
 
-    def save_code_version(self, username: str, code: str, message: str) -> str:
+    def save_code_version(self, username: str, code: str, message: str,
+                          flush_now: bool = False) -> Optional[str]:
         file_path = self.repo_path / f"{username}_latest.py"
         with open(file_path, 'w') as f:
             f.write(code)
-        
-        self.repo.index.add([str(file_path)])
-        commit = self.repo.index.commit(f"{username}: {message}")
+
+        with self._pending_lock:
+            self._pending.append((str(file_path), f"{username}: {message}"))
+            if flush_now:
+                return self._flush_pending()
+            # Debounce: rapid saves land in a single commit
+            if self._flush_timer is None or not self._flush_timer.is_alive():
+                self._flush_timer = threading.Timer(self.FLUSH_DELAY, self._flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        return None
+
+    def _flush(self):
+        with self._pending_lock:
+            self._flush_pending()
+
+    def _flush_pending(self) -> Optional[str]:
+        # Caller holds self._pending_lock
+        if not self._pending:
+            return None
+        paths = [path for path, _ in self._pending]
+        messages = [message for _, message in self._pending]
+        self._pending.clear()
+        self.repo.index.add(paths)
+        commit = self.repo.index.commit("; ".join(messages))
         return commit.hexsha
 
 # Enhanced Code Analysis
+@functools.lru_cache(maxsize=64)
+def _cached_parse(code: str) -> ast.AST:
+    """Parse source once per unique string; reruns reuse the cached tree."""
+    return ast.parse(code)
+
+_arg_name = operator.attrgetter('arg')
+_cleandoc = inspect.cleandoc
+
+def _extract_docstring(node):
+    # Inlined ast.get_docstring: same result without the extra call
+    # frame and isinstance dispatch per definition
+    body = node.body
+    if not body:
+        return None
+    first = body[0]
+    if type(first) is not ast.Expr:
+        return None
+    value = first.value
+    if type(value) is ast.Constant and isinstance(value.value, str):
+        return _cleandoc(value.value)
+    return None
+
+def _on_function(node, out):
+    out[0].append({
+        'name': node.name,
+        'args': list(map(_arg_name, node.args.args)),
+        'docstring': _extract_docstring(node)
+    })
+
+def _on_class(node, out):
+    out[1].append({
+        'name': node.name,
+        'bases': [base.id for base in node.bases if isinstance(base, ast.Name)],
+        'docstring': _extract_docstring(node)
+    })
+
+def _on_import(node, out):
+    out[2].extend(alias.name for alias in node.names)
+
+def _on_import_from(node, out):
+    out[2].append(f"{node.module}.{node.names[0].name}")
+
+# Typed dispatch table: one dict lookup per node instead of chained isinstance
+_DISPATCH = {
+    ast.FunctionDef: _on_function,
+    ast.ClassDef: _on_class,
+    ast.Import: _on_import,
+    ast.ImportFrom: _on_import_from,
+}
+
+# Defs and imports never nest inside pure expressions, so skip those subtrees
+_EXPR_TYPES = frozenset(
+    t for t in vars(ast).values()
+    if isinstance(t, type) and issubclass(t, ast.expr)
+)
+
 def analyze_code_structure(code: str) -> tuple:
     try:
-        tree = ast.parse(code)
-        
+        tree = _cached_parse(code)
+
         functions = []
         classes = []
         imports = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                functions.append({
-                    'name': node.name,
-                    'args': [arg.arg for arg in node.args.args],
-                    'docstring': ast.get_docstring(node)
-                })
-            elif isinstance(node, ast.ClassDef):
-                classes.append({
-                    'name': node.name,
-                    'bases': [base.id for base in node.bases if isinstance(base, ast.Name)],
-                    'docstring': ast.get_docstring(node)
-                })
-            elif isinstance(node, ast.Import):
-                imports.extend(alias.name for alias in node.names)
-            elif isinstance(node, ast.ImportFrom):
-                imports.append(f"{node.module}.{node.names[0].name}")
-        
+        out = (functions, classes, imports)
+
+        dispatch_get = _DISPATCH.get
+        iter_children = ast.iter_child_nodes
+        expr_types = _EXPR_TYPES
+        stack = [tree]
+        pop = stack.pop
+        extend = stack.extend
+        while stack:
+            node = pop()
+            node_type = type(node)
+            handler = dispatch_get(node_type)
+            if handler:
+                handler(node, out)
+            if node_type not in expr_types:
+                extend(iter_children(node))
+
         return functions, classes, imports
     except Exception as e:
         return [], [], []
@@ -165,10 +310,24 @@ class ErrorHandler:
                 return None
         return wrapper
 
-# Initialize managers
-user_manager = UserManager()
-history_manager = DocumentationHistory()
-git_manager = GitManager()
+# Initialize managers lazily; cache_resource construction is guarded by
+# Streamlit's internal lock, so these stay safe as process-wide
+# singletons even on free-threaded builds
+@st.cache_resource
+def get_user_manager():
+    return UserManager()
+
+@st.cache_resource
+def get_history_manager():
+    return DocumentationHistory()
+
+@st.cache_resource
+def get_git_manager():
+    return GitManager()
+
+user_manager = get_user_manager()
+history_manager = get_history_manager()
+git_manager = get_git_manager()
 
 # Streamlit UI Components
 def render_login_ui():
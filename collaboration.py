@@ -1,6 +1,7 @@
 # collaboration.py
 import sqlite3
-from datetime import datetime
+import threading
+import time
 from typing import List, Dict
 import json
 import logging
@@ -10,7 +11,22 @@ logger = logging.getLogger(__name__)
 class CollaborationManager:
     def __init__(self):
         self.conn = sqlite3.connect('collaboration.db', check_same_thread=False)
+        # WAL avoids an fsync of the rollback journal on every commit
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        # WAL supports many concurrent readers; give each thread its own
+        # read-only connection instead of serializing on self.conn
+        self._local = threading.local()
         self.create_tables()
+
+    def _read_conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect('collaboration.db', check_same_thread=False)
+            conn.execute('PRAGMA query_only=1')
+            self._local.conn = conn
+        return conn
     
     def create_tables(self):
         """Create necessary tables for collaboration features"""
@@ -21,23 +37,32 @@ class CollaborationManager:
                 owner TEXT,
                 shared_with TEXT,
                 permissions TEXT,
-                created_at DATETIME)''',
+                created_at INTEGER)''',
             
             '''CREATE TABLE IF NOT EXISTS comments
                (id INTEGER PRIMARY KEY AUTOINCREMENT,
                 doc_id TEXT,
                 user TEXT,
                 comment TEXT,
-                created_at DATETIME)''',
+                created_at INTEGER)''',
             
             '''CREATE TABLE IF NOT EXISTS notifications
                (id INTEGER PRIMARY KEY AUTOINCREMENT,
                 user TEXT,
                 message TEXT,
                 read BOOLEAN,
-                created_at DATETIME)'''
+                created_at INTEGER)''',
+
+            '''CREATE INDEX IF NOT EXISTS ix_notifications_user
+               ON notifications(user)''',
+
+            '''CREATE INDEX IF NOT EXISTS ix_comments_doc
+               ON comments(doc_id)''',
+
+            '''CREATE INDEX IF NOT EXISTS ix_shared_doc
+               ON shared_docs(doc_id)'''
         ]
-        
+
         for query in queries:
             self.conn.execute(query)
         self.conn.commit()
@@ -47,7 +72,7 @@ class CollaborationManager:
         try:
             self.conn.execute(
                 'INSERT INTO shared_docs (doc_id, owner, shared_with, permissions, created_at) VALUES (?, ?, ?, ?, ?)',
-                (doc_id, owner, shared_with, json.dumps(permissions), datetime.now())
+                (doc_id, owner, shared_with, json.dumps(permissions), time.time_ns() // 1000)
             )
             self.conn.commit()
             
@@ -66,7 +91,7 @@ class CollaborationManager:
         try:
             self.conn.execute(
                 'INSERT INTO comments (doc_id, user, comment, created_at) VALUES (?, ?, ?, ?)',
-                (doc_id, user, comment, datetime.now())
+                (doc_id, user, comment, time.time_ns() // 1000)
             )
             self.conn.commit()
             
@@ -90,7 +115,7 @@ class CollaborationManager:
     def get_comments(self, doc_id: str) -> List[Dict]:
         """Get all comments for a document"""
         try:
-            cursor = self.conn.execute(
+            cursor = self._read_conn().execute(
                 'SELECT * FROM comments WHERE doc_id=? ORDER BY created_at DESC',
                 (doc_id,)
             )
@@ -112,7 +137,7 @@ class CollaborationManager:
         try:
             self.conn.execute(
                 'INSERT INTO notifications (user, message, read, created_at) VALUES (?, ?, ?, ?)',
-                (user, message, False, datetime.now())
+                (user, message, False, time.time_ns() // 1000)
             )
             self.conn.commit()
             return True
@@ -120,10 +145,24 @@ class CollaborationManager:
             logger.error(f"Error adding notification: {str(e)}")
             return False
     
+    def add_notifications(self, notifications: List[tuple]):
+        """Add many (user, message) notifications in one transaction"""
+        try:
+            now = time.time_ns() // 1000
+            self.conn.executemany(
+                'INSERT INTO notifications (user, message, read, created_at) VALUES (?, ?, ?, ?)',
+                [(user, message, False, now) for user, message in notifications]
+            )
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error adding notifications: {str(e)}")
+            return False
+
     def get_notifications(self, user: str) -> List[Dict]:
         """Get all notifications for a user"""
         try:
-            cursor = self.conn.execute(
+            cursor = self._read_conn().execute(
                 'SELECT * FROM notifications WHERE user=? ORDER BY created_at DESC',
                 (user,)
             )
@@ -140,6 +179,54 @@ class CollaborationManager:
             logger.error(f"Error getting notifications: {str(e)}")
             return []
     
+    def get_unread_notifications(self, user: str) -> List[Dict]:
+        """Get only the unread notifications for a user"""
+        try:
+            cursor = self._read_conn().execute(
+                'SELECT * FROM notifications WHERE user=? AND read=0 ORDER BY created_at DESC',
+                (user,)
+            )
+            return [
+                {
+                    'id': row[0],
+                    'message': row[2],
+                    'read': row[3],
+                    'created_at': row[4]
+                }
+                for row in cursor.fetchall()
+            ]
+        except Exception as e:
+            logger.error(f"Error getting notifications: {str(e)}")
+            return []
+
+    def get_unread_count(self, user: str) -> int:
+        """Count unread notifications without fetching the rows"""
+        try:
+            cursor = self._read_conn().execute(
+                'SELECT COUNT(*) FROM notifications WHERE user=? AND read=0',
+                (user,)
+            )
+            return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"Error counting notifications: {str(e)}")
+            return 0
+
+    def mark_notifications_read(self, notification_ids: List[int]):
+        """Mark many notifications as read in one statement"""
+        try:
+            if not notification_ids:
+                return True
+            placeholders = ','.join('?' * len(notification_ids))
+            self.conn.execute(
+                f'UPDATE notifications SET read=1 WHERE id IN ({placeholders})',
+                notification_ids
+            )
+            self.conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Error marking notifications read: {str(e)}")
+            return False
+
     def mark_notification_read(self, notification_id: int):
         """Mark a notification as read"""
         try:
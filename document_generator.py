@@ -1,36 +1,258 @@
 # document_generator.py
+import asyncio
+import hashlib
+import math
+import os
 import ollama
-from typing import Dict, Any
+from ollama import AsyncClient
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Returned by the async batch path when generation fails; callers that
+# cache or persist results must check for it instead of storing it.
+# The streaming path raises instead, so partial output is never
+# mistaken for a complete result.
+GENERATION_ERROR = "Error generating documentation. Please try again."
+
 class DocumentGenerator:
+    # Exact-match LRU size and the cosine similarity above which a
+    # previously generated answer is reused for a near-duplicate prompt
+    CACHE_SIZE = 128
+    SEMANTIC_THRESHOLD = 0.95
+    EMBED_MODEL = 'nomic-embed-text'
+
     def __init__(self, model_name: str = 'deepseek-r1:1.5b'):
         self.model_name = model_name
+        self._aclient = None
+        self._exact_cache = OrderedDict()
+        self._semantic_index = []
+        self._embeddings_available = True
+
+    def _async_client(self) -> AsyncClient:
+        if self._aclient is None:
+            self._aclient = AsyncClient()
+        return self._aclient
     
+    def _embed(self, prompt: str) -> Optional[List[float]]:
+        """Embed a prompt for the semantic cache; None if unavailable"""
+        if not self._embeddings_available:
+            return None
+        try:
+            return ollama.embeddings(model=self.EMBED_MODEL, prompt=prompt)['embedding']
+        except Exception as e:
+            # Embedding model not pulled or server too old; stay exact-only
+            logger.info(f"Semantic cache disabled: {str(e)}")
+            self._embeddings_available = False
+            return None
+
+    async def _aembed(self, prompt: str) -> Optional[List[float]]:
+        """Async variant of _embed; a synchronous embeddings call here
+        would block the event loop and serialize generate_batch"""
+        if not self._embeddings_available:
+            return None
+        try:
+            response = await self._async_client().embeddings(
+                model=self.EMBED_MODEL, prompt=prompt
+            )
+            return response['embedding']
+        except Exception as e:
+            logger.info(f"Semantic cache disabled: {str(e)}")
+            self._embeddings_available = False
+            return None
+
+    @staticmethod
+    def _cosine(a: List[float], b: List[float]) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm_a = math.sqrt(sum(x * x for x in a))
+        norm_b = math.sqrt(sum(x * x for x in b))
+        if not norm_a or not norm_b:
+            return 0.0
+        return dot / (norm_a * norm_b)
+
+    def _exact_lookup(self, prompt: str) -> Optional[str]:
+        key = hashlib.sha256(prompt.encode()).hexdigest()
+        cached = self._exact_cache.get(key)
+        if cached is not None:
+            self._exact_cache.move_to_end(key)
+        return cached
+
+    def _semantic_lookup(self, vector: List[float]) -> Optional[str]:
+        best_score = 0.0
+        best_response = None
+        for stored_vector, response in self._semantic_index:
+            score = self._cosine(vector, stored_vector)
+            if score > best_score:
+                best_score = score
+                best_response = response
+        if best_score >= self.SEMANTIC_THRESHOLD:
+            return best_response
+        return None
+
+    def _store_exact(self, prompt: str, documentation: str):
+        key = hashlib.sha256(prompt.encode()).hexdigest()
+        self._exact_cache[key] = documentation
+        while len(self._exact_cache) > self.CACHE_SIZE:
+            self._exact_cache.popitem(last=False)
+
+    def _store_semantic(self, vector: List[float], documentation: str):
+        self._semantic_index.append((vector, documentation))
+        del self._semantic_index[:-self.CACHE_SIZE]
+
+    def _cache_lookup(self, prompt: str) -> Optional[str]:
+        """Return a cached response for this or a near-duplicate prompt"""
+        cached = self._exact_lookup(prompt)
+        if cached is not None:
+            return cached
+        vector = self._embed(prompt)
+        if vector:
+            return self._semantic_lookup(vector)
+        return None
+
+    async def _acache_lookup(self, prompt: str) -> Optional[str]:
+        """_cache_lookup with the embedding awaited, for async callers"""
+        cached = self._exact_lookup(prompt)
+        if cached is not None:
+            return cached
+        vector = await self._aembed(prompt)
+        if vector:
+            return self._semantic_lookup(vector)
+        return None
+
+    def _cache_store(self, prompt: str, documentation: str):
+        self._store_exact(prompt, documentation)
+        vector = self._embed(prompt)
+        if vector:
+            self._store_semantic(vector, documentation)
+
+    async def _acache_store(self, prompt: str, documentation: str):
+        self._store_exact(prompt, documentation)
+        vector = await self._aembed(prompt)
+        if vector:
+            self._store_semantic(vector, documentation)
+
     def generate_documentation(self, code: str, analysis: Dict[str, Any]) -> str:
         """
         Generate comprehensive documentation using the LLM model.
-        
+
+        Args:
+            code (str): Source code
+            analysis (Dict): Code analysis results
+
+        Returns:
+            str: Generated documentation
+        """
+        # Single code path: consume the streaming generator and join, so
+        # callers that want the full string share its caching and errors
+        return "".join(self.generate_documentation_stream(code, analysis))
+    
+    async def agenerate_documentation(self, code: str, analysis: Dict[str, Any]) -> str:
+        """
+        Async variant of generate_documentation for overlapping requests.
+
         Args:
             code (str): Source code
             analysis (Dict): Code analysis results
-            
+
         Returns:
             str: Generated documentation
         """
         try:
             prompt = self._create_prompt(code, analysis)
-            response = ollama.chat(
+            cached = await self._acache_lookup(prompt)
+            if cached is not None:
+                return cached
+            response = await self._async_client().chat(
                 model=self.model_name,
                 messages=[{"role": "user", "content": prompt}]
             )
-            return response['message']['content']
+            documentation = response['message']['content']
+            await self._acache_store(prompt, documentation)
+            return documentation
         except Exception as e:
             logger.error(f"Error generating documentation: {str(e)}")
-            return "Error generating documentation. Please try again."
-    
+            return GENERATION_ERROR
+
+    async def generate_batch(self, items: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """
+        Generate documentation for many (code, analysis) pairs concurrently.
+
+        Requests overlap up to the server's parallel slots
+        (OLLAMA_NUM_PARALLEL, default 4), giving near-linear speedup on
+        this I/O-bound workload.
+
+        Args:
+            items (List): (code, analysis) pairs
+
+        Returns:
+            List of generated documentation strings, in input order
+        """
+        semaphore = asyncio.Semaphore(int(os.getenv("OLLAMA_NUM_PARALLEL", "4")))
+
+        async def _bounded(code, analysis):
+            async with semaphore:
+                return await self.agenerate_documentation(code, analysis)
+
+        # Identical submissions collapse to one model call; the shared
+        # result is scattered back to every original position
+        digests = []
+        unique = {}
+        for code, analysis in items:
+            prompt = self._create_prompt(code, analysis)
+            digest = hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+            digests.append(digest)
+            if digest not in unique:
+                unique[digest] = (code, analysis)
+
+        tasks = [_bounded(code, analysis) for code, analysis in unique.values()]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        by_digest = dict(zip(unique.keys(), results))
+        return [by_digest[digest] for digest in digests]
+
+    def generate_documentation_stream(self, code: str, analysis: Dict[str, Any]) -> Iterator[str]:
+        """
+        Generate documentation as a stream of text chunks.
+
+        Yields chunks as the model produces them so the UI can render
+        progressively instead of blocking on the full response.
+
+        Args:
+            code (str): Source code
+            analysis (Dict): Code analysis results
+
+        Yields:
+            str: Documentation text chunks
+
+        Raises:
+            Exception: On generation failure, including mid-stream;
+                text yielded before the failure is partial
+        """
+        try:
+            prompt = self._create_prompt(code, analysis)
+            cached = self._cache_lookup(prompt)
+            if cached is not None:
+                yield cached
+                return
+            response = ollama.chat(
+                model=self.model_name,
+                messages=[{"role": "user", "content": prompt}],
+                stream=True
+            )
+            parts = []
+            for chunk in response:
+                content = chunk['message']['content']
+                parts.append(content)
+                yield content
+            self._cache_store(prompt, "".join(parts))
+        except Exception as e:
+            logger.error(f"Error generating documentation: {str(e)}")
+            # Re-raise rather than yielding a sentinel: a mid-stream
+            # failure would otherwise join partial text with the
+            # sentinel and look like a complete result to callers
+            raise
+
     def _create_prompt(self, code: str, analysis: Dict[str, Any]) -> str:
         return f"""
         Generate comprehensive documentation for the following Python code.
@@ -1,46 +1,95 @@
 from docx import Document
 from fpdf import FPDF
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+import copy
 import json
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from io import BytesIO
 import os
 import tempfile
-import re
 import logging
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# python-docx reads its default template from disk on every Document();
+# load it once and hand out deep copies instead
+_DOCX_TEMPLATE = None
+
+def _new_document() -> Document:
+    global _DOCX_TEMPLATE
+    if _DOCX_TEMPLATE is None:
+        _DOCX_TEMPLATE = Document()
+    return copy.deepcopy(_DOCX_TEMPLATE)
+
+def _export_one(args):
+    # Module-level so ProcessPoolExecutor can pickle it
+    documentation, filename, output_dir, fmt = args
+    if fmt == 'pdf':
+        return DocumentExporter.export_pdf(documentation, filename, output_dir)
+    return DocumentExporter.export_docx(documentation, filename, output_dir)
+
+def _new_pdf() -> FPDF:
+    """Fresh FPDF instance with the standard page and font applied"""
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    return pdf
+
+def _build_pdf(sanitized_documentation: str) -> FPDF:
+    """Render sanitized documentation into an FPDF instance"""
+    pdf = _new_pdf()
+
+    # Auto page break must stay on: multi_cell only wraps horizontally,
+    # so a paragraph taller than the remaining page would otherwise be
+    # drawn past the bottom edge and lost
+    pdf.set_auto_page_break(True, margin=15)
+
+    # One multi_cell per paragraph; FPDF wraps lines internally,
+    # so no per-line cell calls or manual 80-char slicing
+    for paragraph in sanitized_documentation.split('\n\n'):
+        pdf.multi_cell(0, 10, txt=paragraph)
+
+    return pdf
+
+def _build_docx(documentation: str):
+    """Render documentation into a python-docx Document"""
+    doc = _new_document()
+    doc.add_heading('Code Documentation', 0)
+    for paragraph in documentation.split('\n\n'):
+        if paragraph.strip():
+            doc.add_paragraph(paragraph)
+    return doc
+
 class DocumentExporter:
+    # Translation table for common Unicode characters, applied in a
+    # single C-level pass instead of one full-copy replace() each
+    _TRANSLATE = str.maketrans({
+        0x2014: '--',  # em dash
+        0x2013: '-',   # en dash
+        0x2018: "'",   # left single quotation mark
+        0x2019: "'",   # right single quotation mark
+        0x201c: '"',   # left double quotation mark
+        0x201d: '"',   # right double quotation mark
+        0x2022: '*',   # bullet
+        0x2026: '...', # ellipsis
+        0x00a9: '(c)', # copyright symbol
+        0x00ae: '(R)', # registered trademark symbol
+        0x2122: '(TM)',# trademark symbol
+        # Add more replacements as needed
+    })
+
     @staticmethod
     def sanitize_text(text):
         """
-        Sanitize text to be compatible with FPDF by replacing Unicode characters 
+        Sanitize text to be compatible with FPDF by replacing Unicode characters
         with their closest ASCII equivalents
         """
-        # Define replacements for common Unicode characters
-        replacements = {
-            '\u2014': '--',  # em dash
-            '\u2013': '-',   # en dash
-            '\u2018': "'",   # left single quotation mark
-            '\u2019': "'",   # right single quotation mark
-            '\u201c': '"',   # left double quotation mark
-            '\u201d': '"',   # right double quotation mark
-            '\u2022': '*',   # bullet
-            '\u2026': '...', # ellipsis
-            '\u00a9': '(c)', # copyright symbol
-            '\u00ae': '(R)', # registered trademark symbol
-            '\u2122': '(TM)',# trademark symbol
-            # Add more replacements as needed
-        }
-        
-        # Replace unsupported characters
-        for unicode_char, replacement in replacements.items():
-            text = text.replace(unicode_char, replacement)
-        
-        # Remove remaining non-Latin-1 characters
-        text = re.sub(r'[^\x00-\xff]', ' ', text)
-        
-        return text
+        text = text.translate(DocumentExporter._TRANSLATE)
+        # Replace remaining non-Latin-1 characters via a codec round trip
+        return text.encode('latin-1', errors='replace').decode('latin-1')
     
     @staticmethod
     def export_pdf(documentation, filename=None, output_dir=None):
@@ -73,20 +122,9 @@ class DocumentExporter:
             # Set output file path
             output_path = os.path.join(output_dir, filename)
             
-            # Create a PDF instance
-            pdf = FPDF()
-            pdf.add_page()
-            
-            # Set font for the PDF
-            pdf.set_font("Arial", size=12)
-            
-            # Split the documentation into lines and add to PDF
-            for line in sanitized_documentation.split('\n'):
-                # Limit line length to prevent overflows
-                chunks = [line[i:i+80] for i in range(0, len(line), 80)]
-                for chunk in chunks:
-                    pdf.cell(0, 10, txt=chunk, ln=True)
-            
+            # Build the PDF in memory
+            pdf = _build_pdf(sanitized_documentation)
+
             # Output the PDF to the specified path
             pdf.output(output_path)
             
@@ -97,6 +135,106 @@ class DocumentExporter:
             logger.error(f"Failed to generate PDF: {str(e)}", exc_info=True)
             raise
     
+    @staticmethod
+    def export_pdf_bytes(documentation) -> bytes:
+        """
+        Render documentation to PDF and return the bytes in memory
+
+        Skips the disk round trip entirely; callers that serve downloads
+        can hand the bytes straight to the client.
+
+        Args:
+            documentation (str): Documentation text to export
+
+        Returns:
+            bytes: The rendered PDF
+        """
+        try:
+            sanitized_documentation = DocumentExporter.sanitize_text(documentation)
+            pdf = _build_pdf(sanitized_documentation)
+            return bytes(pdf.output())
+        except Exception as e:
+            logger.error(f"Failed to generate PDF: {str(e)}", exc_info=True)
+            raise
+
+    @staticmethod
+    def export_docx_bytes(documentation) -> bytes:
+        """
+        Render documentation to DOCX and return the bytes in memory
+
+        Args:
+            documentation (str): Documentation text to export
+
+        Returns:
+            bytes: The rendered DOCX
+        """
+        try:
+            doc = _build_docx(documentation)
+            buffer = BytesIO()
+            doc.save(buffer)
+            return buffer.getvalue()
+        except Exception as e:
+            logger.error(f"Failed to generate DOCX: {str(e)}", exc_info=True)
+            raise
+
+    @staticmethod
+    def export_pdf_streaming(documentation, filename=None, output_dir=None):
+        """
+        Export documentation to PDF, flushing pages to disk as they complete
+
+        Uses reportlab's incremental canvas, so peak memory stays at
+        roughly one page regardless of document length. Prefer this over
+        export_pdf for very large documents.
+
+        Args:
+            documentation (str): Documentation text to export
+            filename (str, optional): Output filename. Defaults to None.
+            output_dir (str, optional): Directory to save the file. Defaults to None.
+
+        Returns:
+            str: Path to the generated PDF file
+        """
+        try:
+            sanitized_documentation = DocumentExporter.sanitize_text(documentation)
+
+            if filename is None:
+                filename = f"documentation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+
+            if output_dir is None:
+                output_dir = os.path.join(tempfile.gettempdir(), 'exports')
+
+            os.makedirs(output_dir, exist_ok=True)
+            output_path = os.path.join(output_dir, filename)
+
+            page_width, page_height = A4
+            top, bottom, line_height = page_height - 40, 40, 14
+
+            pdf_canvas = canvas.Canvas(output_path, pagesize=A4)
+            text_object = pdf_canvas.beginText(40, top)
+            text_object.setFont("Helvetica", 12)
+            y = top
+
+            for line in sanitized_documentation.split('\n'):
+                if y <= bottom:
+                    # Finish the page; reportlab writes it out immediately
+                    pdf_canvas.drawText(text_object)
+                    pdf_canvas.showPage()
+                    text_object = pdf_canvas.beginText(40, top)
+                    text_object.setFont("Helvetica", 12)
+                    y = top
+                text_object.textLine(line)
+                y -= line_height
+
+            pdf_canvas.drawText(text_object)
+            pdf_canvas.save()
+
+            logger.info(f"PDF generated successfully at: {output_path}")
+            return output_path
+
+        except Exception as e:
+            logger.error(f"Failed to generate PDF: {str(e)}", exc_info=True)
+            raise
+
     @staticmethod
     def export_docx(documentation, filename=None, output_dir=None):
         """
@@ -125,15 +263,9 @@ class DocumentExporter:
             # Set output file path
             output_path = os.path.join(output_dir, filename)
             
-            # Create a Document instance
-            doc = Document()
-            doc.add_heading('Code Documentation', 0)
-            
-            # Add content to document
-            for paragraph in documentation.split('\n\n'):
-                if paragraph.strip():
-                    doc.add_paragraph(paragraph)
-            
+            # Build the document from the cached template
+            doc = _build_docx(documentation)
+
             # Save the document
             doc.save(output_path)
             
@@ -143,6 +275,27 @@ class DocumentExporter:
         except Exception as e:
             logger.error(f"Failed to generate DOCX: {str(e)}", exc_info=True)
             raise
+    @staticmethod
+    def export_many(items, fmt='pdf', output_dir=None, workers=None):
+        """
+        Export many documents in parallel across worker processes
+
+        Args:
+            items: Iterable of (documentation, filename) pairs
+            fmt (str): 'pdf' or 'docx'. Defaults to 'pdf'.
+            output_dir (str, optional): Directory to save the files
+            workers (int, optional): Worker process count (default: CPU count)
+
+        Returns:
+            List[str]: Paths to the generated files, in input order
+        """
+        fmt = fmt.lower()
+        args = [(documentation, filename, output_dir, fmt)
+                for documentation, filename in items]
+        # Exports are CPU-bound and independent, so worker processes
+        # scale with cores instead of contending for the GIL
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_export_one, args))
 
 # Example usage
 if __name__ == "__main__":
@@ -1,4 +1,6 @@
 import os
+import sqlite3
+import subprocess
 from git import Repo, GitCommandError, InvalidGitRepositoryError
 from git.exc import NoSuchPathError
 from datetime import datetime
@@ -19,6 +21,22 @@ class GitIntegrationError(Exception):
     """Custom exception for Git integration errors"""
     pass
 
+def _backup_copy(src, dst):
+    """Copy function for backups: hard-link immutable git objects only.
+
+    Documents and the SQLite files are rewritten in place later, and a
+    hard link would let those writes mutate the backup; git object files
+    are content-addressed and never modified, so linking them is safe.
+    """
+    if f'{os.sep}.git{os.sep}objects{os.sep}' in src:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            # Cross-device or unsupported filesystem; fall through to copy
+            pass
+    shutil.copy2(src, dst)
+
 class GitManager:
     def __init__(self, base_path: str = 'docs_repo', remote_url: Optional[str] = None):
         """
@@ -30,9 +48,9 @@ class GitManager:
         """
         self.base_path = Path(base_path)
         self.remote_url = remote_url
+        self._config_checked = False
         self.repo = self._initialize_repository()
-        self.metadata_file = self.base_path / 'metadata.json'
-        self._initialize_metadata()
+        self._db = self._initialize_metadata()
 
     def _initialize_repository(self) -> Repo:
         """
@@ -56,13 +74,16 @@ class GitManager:
                 repo.index.add(['README.md'])
                 repo.index.commit("Initial commit")
                 
-                # Configure git user if not set
-                if not repo.config_reader().has_section('user'):
-                    config_writer = repo.config_writer()
-                    config_writer.set_value("user", "name", "Documentation Generator")
-                    config_writer.set_value("user", "email", "doc.generator@example.com")
-                    config_writer.release()
-                
+                # Write the user config unconditionally; reading the
+                # config back just to check for the section costs more
+                # than the idempotent write it guards
+                config_writer = repo.config_writer()
+                config_writer.set_value("user", "name", "Documentation Generator")
+                config_writer.set_value("user", "email", "doc.generator@example.com")
+                config_writer.release()
+                self._config_checked = True
+
+
                 # Set up remote if provided
                 if self.remote_url:
                     repo.create_remote('origin', self.remote_url)
@@ -75,33 +96,100 @@ class GitManager:
             logger.error(f"Error initializing repository: {str(e)}")
             raise GitIntegrationError(f"Failed to initialize repository: {str(e)}")
 
-    def _initialize_metadata(self):
-        """Initialize metadata file for tracking document information"""
-        if not self.metadata_file.exists():
-            metadata = {
-                'documents': {},
-                'last_updated': datetime.now().isoformat()
-            }
-            self.metadata_file.write_text(json.dumps(metadata, indent=2))
-            self.repo.index.add(['metadata.json'])
-            self.repo.index.commit("Initialize metadata tracking")
+    def _initialize_metadata(self) -> sqlite3.Connection:
+        """Initialize the SQLite store tracking document information"""
+        db = sqlite3.connect(str(self.base_path / 'metadata.db'), check_same_thread=False)
+        db.execute('''CREATE TABLE IF NOT EXISTS docs
+                      (doc_id TEXT PRIMARY KEY,
+                       info TEXT,
+                       updated_at TEXT)''')
+        db.execute('CREATE INDEX IF NOT EXISTS ix_docs_updated ON docs(updated_at)')
+        db.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS doc_fts USING fts5
+                      (doc_id UNINDEXED,
+                       content,
+                       metadata,
+                       tokenize='porter unicode61')''')
+        db.commit()
+        # Keep the metadata store out of the documentation commits
+        gitignore = self.base_path / '.gitignore'
+        if not gitignore.exists():
+            gitignore.write_text('metadata.db\n')
+        self._import_legacy_metadata(db)
+        return db
 
-    def _update_metadata(self, doc_id: str, info: Dict):
+    def _import_legacy_metadata(self, db: sqlite3.Connection):
+        """Backfill the store from a pre-SQLite metadata.json, once"""
+        legacy = self.base_path / 'metadata.json'
+        if not legacy.exists() or db.execute('SELECT 1 FROM docs LIMIT 1').fetchone():
+            return
+        try:
+            metadata = json.loads(legacy.read_text())
+            for doc_id, info in metadata.get('documents', {}).items():
+                info_json = json.dumps(info)
+                db.execute(
+                    'INSERT OR REPLACE INTO docs (doc_id, info, updated_at) VALUES (?, ?, ?)',
+                    (doc_id, info_json, info.get('last_updated', ''))
+                )
+                doc_path = self.base_path / 'documents' / doc_id / 'content.md'
+                content = doc_path.read_text() if doc_path.exists() else ''
+                db.execute(
+                    'INSERT INTO doc_fts (doc_id, content, metadata) VALUES (?, ?, ?)',
+                    (doc_id, content, info_json)
+                )
+            db.commit()
+            logger.info(f"Imported {len(metadata.get('documents', {}))} documents from metadata.json")
+        except Exception as e:
+            logger.error(f"Error importing legacy metadata: {str(e)}")
+
+    def _update_metadata(self, doc_id: str, info: Dict, now: str = None):
         """Update metadata for a specific document"""
         try:
-            metadata = json.loads(self.metadata_file.read_text())
-            metadata['documents'][doc_id] = {
-                **info,
-                'last_updated': datetime.now().isoformat()
-            }
-            metadata['last_updated'] = datetime.now().isoformat()
-            self.metadata_file.write_text(json.dumps(metadata, indent=2))
-            self.repo.index.add(['metadata.json'])
+            # Callers saving several documents pass one timestamp for the
+            # whole batch instead of paying a now()/isoformat per row
+            if now is None:
+                now = datetime.now().isoformat()
+            self._db.execute(
+                'INSERT OR REPLACE INTO docs (doc_id, info, updated_at) VALUES (?, ?, ?)',
+                (doc_id, json.dumps({**info, 'last_updated': now}), now)
+            )
+            self._db.commit()
             return True
         except Exception as e:
             logger.error(f"Error updating metadata: {str(e)}")
             return False
 
+    def _index_document(self, doc_id: str, content: str, info: Dict):
+        """Refresh the full-text index entry for a document"""
+        try:
+            self._db.execute('DELETE FROM doc_fts WHERE doc_id=?', (doc_id,))
+            self._db.execute(
+                'INSERT INTO doc_fts (doc_id, content, metadata) VALUES (?, ?, ?)',
+                (doc_id, content, json.dumps(info))
+            )
+            self._db.commit()
+        except Exception as e:
+            logger.error(f"Error indexing document: {str(e)}")
+
+    def _get_metadata(self, doc_id: str) -> Dict:
+        """Get stored metadata for a single document"""
+        row = self._db.execute(
+            'SELECT info FROM docs WHERE doc_id=?', (doc_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def _git(self, *args: str) -> str:
+        """Run a git plumbing command against the repository.
+
+        Read-heavy queries go through the git binary directly; GitPython
+        builds a full Python object per commit/blob, which is an order of
+        magnitude slower for log and show.
+        """
+        result = subprocess.run(
+            ['git', '-C', str(self.base_path), *args],
+            capture_output=True, text=True, check=True
+        )
+        return result.stdout
+
     def create_branch(self, branch_name: str) -> bool:
         """
         Create a new branch.
@@ -151,14 +239,16 @@ class GitManager:
             doc_path.write_text(content)
             
             # Update metadata
+            now = datetime.now().isoformat()
             metadata_update = {
                 'author': author,
                 'version': version,
                 'tags': tags or [],
-                'created_at': datetime.now().isoformat()
+                'created_at': now
             }
-            self._update_metadata(doc_id, metadata_update)
-            
+            self._update_metadata(doc_id, metadata_update, now)
+            self._index_document(doc_id, content, metadata_update)
+
             # Commit changes
             self.repo.index.add([str(doc_path.relative_to(self.base_path))])
             commit_message = f"""
@@ -176,6 +266,57 @@ class GitManager:
             logger.error(f"Error saving document: {str(e)}")
             return False
 
+    def save_documents(self, documents: List[Dict]) -> bool:
+        """
+        Save a batch of documents in a single commit.
+
+        Writes every file first, then stages and commits them together,
+        so the commit overhead is paid once per batch instead of per
+        document.
+
+        Args:
+            documents (List[Dict]): Dicts with the same keys as
+                save_document: doc_id, content, author, and optionally
+                version and tags
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            if not documents:
+                return True
+
+            staged = []
+            now = datetime.now().isoformat()
+            for doc in documents:
+                doc_id = doc['doc_id']
+                doc_dir = self.base_path / 'documents' / doc_id
+                doc_dir.mkdir(parents=True, exist_ok=True)
+
+                doc_path = doc_dir / 'content.md'
+                doc_path.write_text(doc['content'])
+                staged.append(str(doc_path.relative_to(self.base_path)))
+
+                metadata_update = {
+                    'author': doc['author'],
+                    'version': doc.get('version', '1.0'),
+                    'tags': doc.get('tags', []),
+                    'created_at': now
+                }
+                self._update_metadata(doc_id, metadata_update, now)
+                self._index_document(doc_id, doc['content'], metadata_update)
+
+            self.repo.index.add(staged)
+            doc_ids = ', '.join(doc['doc_id'] for doc in documents)
+            self.repo.index.commit(f"Update {len(documents)} documents: {doc_ids}")
+
+            logger.info(f"Successfully saved {len(documents)} documents")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error saving documents: {str(e)}")
+            return False
+
     def get_document_history(self, doc_id: str) -> List[Dict]:
         """
         Get the commit history for a specific document.
@@ -188,16 +329,22 @@ class GitManager:
         """
         try:
             doc_path = f'documents/{doc_id}/content.md'
+            # One git invocation with a machine-parseable separator
+            # instead of instantiating a Commit object per entry
+            output = self._git(
+                'log', '--pretty=format:%H%x1f%an%x1f%aI%x1f%s', '--', doc_path
+            )
             commits = []
-            
-            for commit in self.repo.iter_commits(paths=doc_path):
+
+            for line in output.splitlines():
+                commit_hash, author, date, message = line.split('\x1f')
                 commits.append({
-                    'hash': commit.hexsha,
-                    'author': commit.author.name,
-                    'date': commit.committed_datetime.isoformat(),
-                    'message': commit.message.strip()
+                    'hash': commit_hash,
+                    'author': author,
+                    'date': date,
+                    'message': message
                 })
-            
+
             return commits
         except Exception as e:
             logger.error(f"Error getting document history: {str(e)}")
@@ -216,9 +363,7 @@ class GitManager:
         """
         try:
             doc_path = f'documents/{doc_id}/content.md'
-            commit = self.repo.commit(commit_hash)
-            blob = commit.tree / doc_path
-            return blob.data_stream.read().decode('utf-8')
+            return self._git('show', f'{commit_hash}:{doc_path}')
         except Exception as e:
             logger.error(f"Error getting document version: {str(e)}")
             return None
@@ -237,21 +382,20 @@ class GitManager:
         """
         try:
             doc_path = f'documents/{doc_id}/content.md'
-            diff_index = self.repo.commit(commit1).tree.diff(
-                self.repo.commit(commit2),
-                paths=[doc_path]
+            # Same plumbing route as history/version reads: one
+            # name-status diff to detect a change, then git show for
+            # the two contents
+            status = self._git(
+                'diff', '--name-status', commit1, commit2, '--', doc_path
             )
-            
-            changes = []
-            for diff in diff_index:
-                if diff.a_path == doc_path:
-                    changes.append({
-                        'old_content': diff.a_blob.data_stream.read().decode('utf-8'),
-                        'new_content': diff.b_blob.data_stream.read().decode('utf-8'),
-                        'change_type': diff.change_type
-                    })
-            
-            return changes
+            if not status.strip():
+                return []
+
+            return [{
+                'old_content': self._git('show', f'{commit1}:{doc_path}'),
+                'new_content': self._git('show', f'{commit2}:{doc_path}'),
+                'change_type': status.split('\t', 1)[0].strip()
+            }]
         except Exception as e:
             logger.error(f"Error comparing versions: {str(e)}")
             return []
@@ -267,22 +411,26 @@ class GitManager:
             List[Dict]: Matching documents with their metadata
         """
         try:
-            metadata = json.loads(self.metadata_file.read_text())
-            results = []
-            
-            for doc_id, info in metadata['documents'].items():
-                doc_path = self.base_path / 'documents' / doc_id / 'content.md'
-                if doc_path.exists():
-                    content = doc_path.read_text().lower()
-                    if (query.lower() in content or
-                        query.lower() in json.dumps(info).lower()):
-                        results.append({
-                            'doc_id': doc_id,
-                            'metadata': info,
-                            'preview': content[:200] + '...' if len(content) > 200 else content
-                        })
-            
-            return results
+            # FTS5 index lookup ranked by bm25 instead of re-reading and
+            # scanning every document file per query. The query is
+            # quoted so hyphens, quotes and stray operators are matched
+            # as text instead of raising an FTS5 syntax error
+            match_query = '"' + query.replace('"', '""') + '"'
+            rows = self._db.execute(
+                '''SELECT doc_id, metadata, snippet(doc_fts, 1, '', '', '...', 32)
+                   FROM doc_fts WHERE doc_fts MATCH ?
+                   ORDER BY bm25(doc_fts) LIMIT 50''',
+                (match_query,)
+            ).fetchall()
+
+            return [
+                {
+                    'doc_id': doc_id,
+                    'metadata': json.loads(info_json),
+                    'preview': preview
+                }
+                for doc_id, info_json, preview in rows
+            ]
         except Exception as e:
             logger.error(f"Error searching documents: {str(e)}")
             return []
@@ -299,7 +447,10 @@ class GitManager:
         """
         try:
             backup_path = Path(backup_dir) / f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            shutil.copytree(self.base_path, backup_path)
+            # Immutable git objects are hard-linked (directory entries
+            # only); everything rewritten in place is copied so the
+            # backup stays a true snapshot
+            shutil.copytree(self.base_path, backup_path, copy_function=_backup_copy)
             logger.info(f"Created backup at: {backup_path}")
             return True
         except Exception as e:
@@ -347,8 +498,7 @@ class GitManager:
         """
         try:
             commits = self.get_document_history(doc_id)
-            metadata = json.loads(self.metadata_file.read_text())
-            doc_info = metadata['documents'].get(doc_id, {})
+            doc_info = self._get_metadata(doc_id)
             
             return {
                 'total_revisions': len(commits),
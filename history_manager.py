@@ -1,13 +1,64 @@
 # history_manager.py
 import sqlite3
+import threading
+import zlib
 from datetime import datetime
 import json
 
+try:
+    import zstandard
+    _ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=3)
+    _ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+except ImportError:
+    zstandard = None
+
+# First bytes of a zstd frame; used to tell the two formats apart on read
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def _compress(text: str) -> bytes:
+    data = text.encode('utf-8')
+    if zstandard is not None:
+        return _ZSTD_COMPRESSOR.compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(value) -> str:
+    # Rows written before compression was introduced are plain text
+    if isinstance(value, str):
+        return value
+    if value[:4] == _ZSTD_MAGIC and zstandard is not None:
+        return _ZSTD_DECOMPRESSOR.decompress(value).decode('utf-8')
+    return zlib.decompress(value).decode('utf-8')
+
 class HistoryManager:
     def __init__(self):
-        self.conn = sqlite3.connect('documentation_history.db', check_same_thread=False)
+        self.conn = sqlite3.connect(
+            'documentation_history.db',
+            check_same_thread=False,
+            cached_statements=128
+        )
+        # WAL avoids an fsync of the rollback journal on every commit
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        # WAL supports many concurrent readers; give each thread its own
+        # read-only connection instead of serializing on self.conn
+        self._local = threading.local()
         self.create_history_table()
-    
+
+    def _read_conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(
+                'documentation_history.db',
+                check_same_thread=False,
+                cached_statements=128
+            )
+            conn.execute('PRAGMA query_only=1')
+            self._local.conn = conn
+        return conn
+
     def create_history_table(self):
         query = '''CREATE TABLE IF NOT EXISTS documentation_history
                   (id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -17,18 +68,47 @@ class HistoryManager:
                    created_at DATETIME,
                    FOREIGN KEY (username) REFERENCES users(username))'''
         self.conn.execute(query)
+        # Covers the per-user history query, including its DESC ordering
+        self.conn.execute(
+            '''CREATE INDEX IF NOT EXISTS idx_user_time
+               ON documentation_history(username, created_at DESC)'''
+        )
         self.conn.commit()
     
     def add_entry(self, username: str, code: str, documentation: str):
         self.conn.execute(
             'INSERT INTO documentation_history (username, code, documentation, created_at) VALUES (?, ?, ?, ?)',
-            (username, code, documentation, datetime.now())
+            (username, _compress(code), _compress(documentation), datetime.now())
         )
         self.conn.commit()
     
+    def add_entries(self, rows):
+        """Insert many (username, code, documentation) rows in one transaction"""
+        now = datetime.now()
+        with self.conn:
+            self.conn.executemany(
+                'INSERT INTO documentation_history (username, code, documentation, created_at) VALUES (?, ?, ?, ?)',
+                [(username, _compress(code), _compress(documentation), now)
+                 for username, code, documentation in rows]
+            )
+
     def get_user_history(self, username: str, limit: int = 10):
-        cursor = self.conn.execute(
+        cursor = self._read_conn().execute(
             'SELECT * FROM documentation_history WHERE username=? ORDER BY created_at DESC LIMIT ?',
             (username, limit)
         )
-        return cursor.fetchall()
\ No newline at end of file
+        return [
+            (row[0], row[1], _decompress(row[2]), _decompress(row[3]), row[4])
+            for row in cursor.fetchall()
+        ]
+
+    def get_user_history_page(self, username: str, offset: int = 0, limit: int = 10):
+        """Fetch one page of history instead of everything up to a limit"""
+        cursor = self._read_conn().execute(
+            'SELECT * FROM documentation_history WHERE username=? ORDER BY created_at DESC LIMIT ? OFFSET ?',
+            (username, limit, offset)
+        )
+        return [
+            (row[0], row[1], _decompress(row[2]), _decompress(row[3]), row[4])
+            for row in cursor.fetchall()
+        ]
\ No newline at end of file
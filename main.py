@@ -2,54 +2,128 @@ from git_integration import GitManager
 from collaboration import CollaborationManager
 from api_docs import APIDocumentationGenerator
 import streamlit as st
+import hashlib
 import logging
 from auth import Auth
 from code_analyzer import CodeAnalyzer
 from document_generator import DocumentGenerator
 from export_utils import DocumentExporter
 from history_manager import HistoryManager
-import os
-import tempfile
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize components
-auth = Auth()
-doc_generator = DocumentGenerator()
-history_manager = HistoryManager()
+# Export format -> (renderer, MIME type, file extension); adding a
+# format is one entry here instead of another branch in the click path
+EXPORT = {
+    "PDF": (
+        DocumentExporter.export_pdf_bytes,
+        "application/pdf",
+        "pdf",
+    ),
+    "DOCX": (
+        DocumentExporter.export_docx_bytes,
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        "docx",
+    ),
+}
 
-git_integration = GitManager()
-collab_manager = CollaborationManager()
-api_doc_generator = APIDocumentationGenerator()
+# Shared components are created once per process via cache_resource;
+# without it every script rerun rebuilt them, reopening databases and
+# re-initializing the git repository
+@st.cache_resource
+def get_auth():
+    return Auth()
+
+@st.cache_resource
+def get_doc_generator():
+    return DocumentGenerator()
+
+@st.cache_resource
+def get_history_manager():
+    return HistoryManager()
+
+@st.cache_resource
+def get_git_integration():
+    return GitManager()
+
+@st.cache_resource
+def get_collab_manager():
+    return CollaborationManager()
+
+@st.cache_resource
+def get_api_doc_generator():
+    return APIDocumentationGenerator()
+
+# Streamlit hashes the code string and returns the cached result, so
+# identical pastes and reruns skip the AST pass; repeat prompts are
+# handled inside DocumentGenerator's exact/semantic cache, which the
+# streaming path checks before calling the model
+@st.cache_data(max_entries=128, ttl=3600, show_spinner=False)
+def analyze_code(code: str):
+    return CodeAnalyzer.analyze_code_structure(code)
+
+# History changes only when this user generates documentation, so the
+# fetch is cached and cleared explicitly after each new entry
+@st.cache_data(ttl=300, show_spinner=False)
+def get_history_cached(username: str, page: int = 0, page_size: int = 10):
+    return get_history_manager().get_user_history_page(
+        username, page * page_size, page_size
+    )
+
+auth = get_auth()
+doc_generator = get_doc_generator()
+history_manager = get_history_manager()
+
+git_integration = get_git_integration()
+collab_manager = get_collab_manager()
+api_doc_generator = get_api_doc_generator()
 
 # Initialize session state
-if 'logged_in' not in st.session_state:
-    st.session_state['logged_in'] = False
-if 'username' not in st.session_state:
-    st.session_state['username'] = None
-if 'documentation' not in st.session_state:
-    st.session_state['documentation'] = None
-if 'export_ready' not in st.session_state:
-    st.session_state['export_ready'] = False
+for key, default in {
+    'logged_in': False,
+    'username': None,
+    'documentation': None,
+    'export_ready': False,
+    'last_hash': None,
+}.items():
+    st.session_state.setdefault(key, default)
+
+@st.fragment(run_every=30)
+def notifications_sidebar():
+    """Poll notifications on a timer without rerunning the whole script"""
+    # A COUNT(*) is enough for the badge; the rows themselves are only
+    # fetched once the user opens the list
+    unread_count = collab_manager.get_unread_count(st.session_state['username'])
+    if unread_count:
+        st.warning(f"You have {unread_count} unread notifications")
+        # One form submit marks all checked notifications in a single
+        # UPDATE, instead of a button (and a rerun) per notification.
+        # Only unread rows are fetched; read ones were filtered out
+        # client-side before
+        with st.form("notifications_form"):
+            unread = collab_manager.get_unread_notifications(st.session_state['username'])
+            selected = []
+            for notif in unread:
+                st.info(notif['message'])
+                if st.checkbox("Mark as read", key=f"notif_read_{notif['id']}"):
+                    selected.append(notif['id'])
+            if st.form_submit_button("Mark selected as read"):
+                collab_manager.mark_notifications_read(selected)
 
 def main():
     st.title("Advanced Code Documentation Generator")
-    
-    # Add notifications to sidebar
-    if st.session_state.get('logged_in'):
-        with st.sidebar:
-            notifications = collab_manager.get_notifications(st.session_state['username'])
-            unread = [n for n in notifications if not n['read']]
-            if unread:
-                st.warning(f"You have {len(unread)} unread notifications")
-                if st.button("View Notifications"):
-                    for notif in unread:
-                        st.info(notif['message'])
-                        if st.button(f"Mark as Read {notif['id']}"):
-                            collab_manager.mark_notification_read(notif['id'])
-    
+
+    # Handle logout before the auth gate below so the same run renders
+    # the login view; an st.rerun() here would throw away this script
+    # execution just to redraw
+    if st.session_state['logged_in']:
+        st.sidebar.success(f"Logged in as {st.session_state['username']}")
+        if st.sidebar.button("Logout"):
+            st.session_state['logged_in'] = False
+            st.session_state['username'] = None
+
     # Authentication section
     if not st.session_state['logged_in']:
         tab1, tab2 = st.tabs(["Login", "Register"])
@@ -60,9 +134,10 @@ def main():
             password = st.text_input("Password", type="password", key="login_password")
             if st.button("Login"):
                 if auth.login_user(username, password):
+                    # The main interface below is gated on this state
+                    # and renders in the same run; no rerun needed
                     st.session_state['logged_in'] = True
                     st.session_state['username'] = username
-                    st.rerun()
                 else:
                     st.error("Invalid credentials")
         
@@ -76,13 +151,11 @@ def main():
                 else:
                     st.error("Username already exists")
     
-    else:
-        st.sidebar.success(f"Logged in as {st.session_state['username']}")
-        if st.sidebar.button("Logout"):
-            st.session_state['logged_in'] = False
-            st.session_state['username'] = None
-            st.rerun()
-        
+    # Main interface; reached in the same run when login just succeeded
+    if st.session_state['logged_in']:
+        with st.sidebar:
+            notifications_sidebar()
+
         # Documentation type selector
         doc_type = st.radio(
             "Select Documentation Type",
@@ -97,51 +170,76 @@ def main():
             if st.button("Generate Documentation"):
                 if code_input.strip():
                     try:
-                        # Analyze code
-                        functions, classes, relationships = CodeAnalyzer.analyze_code_structure(code_input)
-                        analysis = {
-                            'functions': functions,
-                            'classes': classes,
-                            'relationships': relationships
-                        }
-                        
-                        # Generate documentation
-                        documentation = doc_generator.generate_documentation(code_input, analysis)
-                        
-                        # Clean up unwanted content (e.g., <think>) from documentation
-                        documentation = documentation.lstrip('<think>').lstrip()  # Remove leading <think> and whitespace
-                        
-                        # Store in session state
-                        st.session_state['documentation'] = documentation
-                        st.session_state['export_ready'] = True
-                        
-                        # Log the generated documentation for debugging purposes
-                        logger.debug("Generated Documentation: %s", documentation)
-                        
-                        # Save to history
-                        history_manager.add_entry(
-                            st.session_state['username'],
-                            code_input,
-                            documentation
-                        )
-                        
-                        # Display results
+                        # Analyze code (cached per code string)
+                        functions, classes, relationships = analyze_code(code_input)
+
                         st.write("### Code Analysis:")
                         st.write(f"**Functions Found:** {', '.join(functions) if functions else 'None'}")
                         st.write(f"**Classes Found:** {', '.join(classes) if classes else 'None'}")
                         st.write("### Generated Documentation:")
-                        st.markdown(documentation)
-                    
+                        code_hash = hashlib.blake2b(
+                            code_input.encode('utf-8'), digest_size=16
+                        ).digest()
+                        if st.session_state['last_hash'] == code_hash:
+                            # Unchanged paste re-triggered by a rerun;
+                            # reuse the stored result without touching
+                            # the model or the history table
+                            documentation = st.session_state['documentation']
+                            st.markdown(documentation)
+                        else:
+                            # Stream so the first tokens render without
+                            # waiting for the full response. Failures
+                            # raise out of the stream into the handler
+                            # below, and repeat prompts hit the
+                            # generator's own cache and arrive as a
+                            # single chunk
+                            documentation = st.write_stream(
+                                doc_generator.generate_documentation_stream(code_input, {
+                                    'functions': functions,
+                                    'classes': classes,
+                                    'relationships': relationships
+                                })
+                            )
+
+                            # Clean up unwanted content (e.g., <think>) from documentation;
+                            # lstrip('<think>') would strip any of those characters,
+                            # eating leading letters of the actual text
+                            if documentation.startswith('<think>'):
+                                documentation = documentation[len('<think>'):]
+                            documentation = documentation.lstrip()
+
+                            # Store in session state
+                            st.session_state['documentation'] = documentation
+                            st.session_state['export_ready'] = True
+                            st.session_state['last_hash'] = code_hash
+
+                            # Log a truncated preview, and only when debug
+                            # logging is actually on; the full documentation
+                            # string can be very large
+                            if logger.isEnabledFor(logging.DEBUG):
+                                logger.debug("Generated Documentation: %s", documentation[:512])
+
+                            # Save to history
+                            history_manager.add_entry(
+                                st.session_state['username'],
+                                code_input,
+                                documentation
+                            )
+                            get_history_cached.clear()
+
                     except Exception as e:
                         st.error(f"Error processing code: {str(e)}")
-                        logger.error(f"Error processing code: {str(e)}", exc_info=True)
+                        logger.error(
+                            f"Error processing code: {str(e)}",
+                            exc_info=logger.isEnabledFor(logging.DEBUG)
+                        )
             
             # Export options (separate from the Generate Documentation button)
             if st.session_state['export_ready']:
                 st.subheader("Export Documentation")
                 export_format = st.selectbox(
                     "Export Format",
-                    ["PDF", "DOCX"]
+                    list(EXPORT)
                 )
                 
                 export_button = st.button("Export Documentation")
@@ -153,57 +251,45 @@ def main():
                             st.stop()
                             
                         with st.spinner(f"Generating {export_format} file..."):
-                            # Generate a temporary file with a unique name
-                            temp_dir = tempfile.gettempdir()
-                            
-                            if export_format == "PDF":
-                                file_path = DocumentExporter.export_pdf(documentation, output_dir=temp_dir)
-                                mime_type = "application/pdf"
-                            else:
-                                file_path = DocumentExporter.export_docx(documentation, output_dir=temp_dir)
-                                mime_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                            
-                            # Log the file path for debugging
-                            logger.info(f"Generated file at: {file_path}")
-                            
-                            # Check if file exists
-                            if not os.path.exists(file_path):
-                                st.error(f"Failed to generate {export_format} file: File not created")
-                                logger.error(f"File not found at: {file_path}")
-                                st.stop()
-                            
-                            # Get file size for verification
-                            file_size = os.path.getsize(file_path)
-                            logger.info(f"File size: {file_size} bytes")
-                            
-                            if file_size == 0:
+                            # Render in memory; no temp file to write,
+                            # stat and read back
+                            render, mime_type, extension = EXPORT[export_format]
+                            file_content = render(documentation)
+
+                            logger.info(f"Generated {export_format} in memory: {len(file_content)} bytes")
+
+                            if not file_content:
                                 st.error(f"Generated {export_format} file is empty")
-                                logger.error(f"File is empty: {file_path}")
                                 st.stop()
-                                
-                            # Read file and offer download
-                            with open(file_path, 'rb') as f:
-                                file_content = f.read()
-                                file_name = f"documentation.{export_format.lower()}"
-                                
-                                st.download_button(
-                                    label=f"Download {export_format}",
-                                    data=file_content,
-                                    file_name=file_name,
-                                    mime=mime_type
-                                )
-                                
+
+                            st.download_button(
+                                label=f"Download {export_format}",
+                                data=file_content,
+                                file_name=f"documentation.{extension}",
+                                mime=mime_type
+                            )
+
                             st.success(f"{export_format} file generated successfully!")
                             
                     except Exception as e:
                         st.error(f"Error exporting documentation: {str(e)}")
-                        logger.error(f"Export error: {str(e)}", exc_info=True)
+                        logger.error(
+                            f"Export error: {str(e)}",
+                            exc_info=logger.isEnabledFor(logging.DEBUG)
+                        )
         
         with col2:
             st.header("Documentation History")
-            history = history_manager.get_user_history(st.session_state['username'])
+            # Only the requested page is decompressed and rendered
+            page = int(st.number_input("Page", min_value=1, value=1, step=1))
+            history = get_history_cached(st.session_state['username'], page - 1)
+            # Expanders ship every body to the client even when closed;
+            # render labels only and the body of the one open entry
+            open_entry = st.session_state.get('open_entry')
             for entry in history:
-                with st.expander(f"Documentation from {entry[4]}"):
+                if st.button(f"Documentation from {entry[4]}", key=f"history_{entry[0]}"):
+                    open_entry = st.session_state['open_entry'] = entry[0]
+                if entry[0] == open_entry:
                     st.code(entry[2], language='python')
                     st.markdown(entry[3])
 
@@ -1,7 +1,9 @@
 # git_integration.py
 from git import Repo
 import os
-from typing import List, Dict
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Tuple
 from datetime import datetime
 import logging
 
@@ -10,7 +12,16 @@ logger = logging.getLogger(__name__)
 class GitIntegration:
     def __init__(self, repo_path: str = 'code_docs'):
         self.repo_path = repo_path
+        # Per-instance cache; the join and .md suffix formatting run
+        # once per filename instead of in every method
+        self._md_path = lru_cache(maxsize=1024)(self._build_md_path)
+        # History only changes when a commit lands, so entries are keyed
+        # on (filename, HEAD sha) and reused until HEAD moves
+        self._history_cached = lru_cache(maxsize=256)(self._load_history)
         self.initialize_repo()
+
+    def _build_md_path(self, filename: str) -> str:
+        return os.path.join(self.repo_path, f"{filename}.md")
     
     def initialize_repo(self):
         """Initialize a new git repository if it doesn't exist"""
@@ -28,32 +39,65 @@ class GitIntegration:
     def save_documentation(self, username: str, filename: str, content: str) -> str:
         """Save documentation to git repository"""
         try:
-            file_path = os.path.join(self.repo_path, f"{filename}.md")
-            with open(file_path, 'w') as f:
-                f.write(content)
-            
-            # Stage and commit the file
-            self.repo.index.add([file_path])
+            file_path = self._md_path(filename)
+            # One call with an explicit encoding; plain open() writes
+            # with the platform default
+            Path(file_path).write_text(content, encoding='utf-8')
+
+            # Stage the repo-relative name; GitPython resolves relative
+            # paths against the repo working dir, so the repo_path-
+            # prefixed write path would not be found
+            self.repo.index.add([f"{filename}.md"])
             self.repo.index.commit(f"Documentation update by {username} at {datetime.now()}")
             
             return file_path
         except Exception as e:
             logger.error(f"Error saving to git: {str(e)}")
             raise
-    
+
+    def save_documentations(self, username: str, items: List[Tuple[str, str]]) -> List[str]:
+        """Save many (filename, content) pairs, staged and committed once"""
+        try:
+            paths = []
+            staged = []
+            for filename, content in items:
+                file_path = self._md_path(filename)
+                Path(file_path).write_text(content, encoding='utf-8')
+                paths.append(file_path)
+                staged.append(f"{filename}.md")
+
+            # One staging pass and one commit for the whole batch,
+            # using repo-relative names (see save_documentation)
+            self.repo.index.add(staged)
+            self.repo.index.commit(
+                f"Batch documentation update by {username} at {datetime.now()}"
+            )
+
+            return paths
+        except Exception as e:
+            logger.error(f"Error saving batch to git: {str(e)}")
+            raise
+
+    def _load_history(self, filename: str, head_sha: str) -> List[Dict]:
+        # head_sha is only the cache key; iter_commits reads from HEAD.
+        # The pathspec must be repo-relative — the repo_path-prefixed
+        # path never matches inside the tree (see get_version)
+        commits = []
+        for commit in self.repo.iter_commits(paths=f"{filename}.md"):
+            commits.append({
+                'hash': commit.hexsha,
+                'author': commit.author.name,
+                'date': commit.committed_datetime,
+                'message': commit.message
+            })
+        return commits
+
     def get_history(self, filename: str) -> List[Dict]:
         """Get commit history for a specific file"""
         try:
-            file_path = os.path.join(self.repo_path, f"{filename}.md")
-            commits = []
-            for commit in self.repo.iter_commits(paths=file_path):
-                commits.append({
-                    'hash': commit.hexsha,
-                    'author': commit.author.name,
-                    'date': commit.committed_datetime,
-                    'message': commit.message
-                })
-            return commits
+            # Reading the HEAD sha is O(1); the full history walk only
+            # happens when a new commit has landed
+            return self._history_cached(filename, self.repo.head.commit.hexsha)
         except Exception as e:
             logger.error(f"Error getting git history: {str(e)}")
             return []
@@ -61,10 +105,10 @@ class GitIntegration:
     def get_version(self, filename: str, commit_hash: str) -> str:
         """Get specific version of a file"""
         try:
-            file_path = os.path.join(self.repo_path, f"{filename}.md")
-            commit = self.repo.commit(commit_hash)
-            blob = commit.tree / file_path
-            return blob.data_stream.read().decode('utf-8')
+            # One git show call with the path relative to the repo root;
+            # the old tree walk used the repo_path-prefixed path, which
+            # never matches inside the tree
+            return self.repo.git.show(f"{commit_hash}:{filename}.md")
         except Exception as e:
             logger.error(f"Error getting version: {str(e)}")
             return ""
\ No newline at end of file